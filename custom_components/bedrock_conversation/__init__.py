@@ -6,8 +6,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import llm
 from homeassistant.exceptions import HomeAssistantError
 import voluptuous as vol
+import functools
 import logging
-import asyncio
+from typing import Final
 
 # Essential imports
 from .const import (
@@ -16,6 +17,7 @@ from .const import (
     SERVICE_TOOL_NAME,
     SERVICE_TOOL_ALLOWED_DOMAINS,
     SERVICE_TOOL_ALLOWED_SERVICES,
+    ALLOWED_SERVICE_CALL_ARGUMENTS,
 )
 from .bedrock_client import BedrockClient
 
@@ -23,45 +25,61 @@ _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.CONVERSATION]
 
-# Allowed arguments for service calls
-ALLOWED_SERVICE_CALL_ARGUMENTS = [
-    "brightness",
-    "brightness_pct",
-    "rgb_color",
-    "temperature",
-    "hvac_mode",
-    "target_temp_high",
-    "target_temp_low",
-    "fan_mode",
-    "preset_mode",
-    "humidity",
-    "position",
-    "tilt_position",
-    "volume_level",
-    "media_content_id",
-    "media_content_type",
-    "value",
-]
+_PARAMS_SCHEMA = vol.Schema(
+    {
+        vol.Required("service"): str,
+        vol.Required("target_device"): str,
+    }
+)
+
+_TOOL_DESCRIPTION: Final[str] = (
+    "Calls a Home Assistant service to control a specific device. "
+    "You MUST provide the exact entity_id from the device list in the system prompt. "
+    "Use this tool after identifying the correct device from the user's natural language request. "
+    "For example: if user says 'turn on the lamp', find the entity_id containing 'lamp' from the device list, "
+    "then call this tool with service='light.turn_on' and target_device='light.lamp_entity_id'."
+)
+
+_API_PROMPT: Final[str] = (
+    "You have access to the HassCallService tool to control Home Assistant devices. "
+    "CRITICAL: The device list in the system prompt contains all available devices with their entity_ids. "
+    "When the user asks to control a device, YOU MUST: "
+    "1. Search the device list for a matching entity based on the user's natural language (e.g., 'lamp', 'bedroom light') "
+    "2. Identify the correct entity_id from that list "
+    "3. Call HassCallService with the exact entity_id you found "
+    "NEVER ask the user for an entity_id - always find it yourself from the provided device list."
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _validate_service(service: str) -> tuple[str | None, str | None, str | None]:
+    """Validate a 'domain.service' string against the allowed services.
+
+    Returns a (domain, service_name, error) tuple where error is None if the
+    service may be called. The allow-lists are immutable, so results are cached.
+    """
+    domain, sep, service_name = service.partition(".")
+    if not sep or not service_name:
+        return None, None, f"Invalid service format: {service}. Expected 'domain.service'"
+
+    # Check if domain is allowed
+    if domain not in SERVICE_TOOL_ALLOWED_DOMAINS:
+        return domain, service_name, f"Service domain '{domain}' is not allowed"
+
+    # Check if service is allowed
+    if service not in SERVICE_TOOL_ALLOWED_SERVICES:
+        return domain, service_name, f"Service '{service}' is not allowed"
+
+    return domain, service_name, None
 
 
 class HassServiceTool(llm.Tool):
     """Tool for calling Home Assistant services."""
 
     name = SERVICE_TOOL_NAME
-    description = (
-        "Calls a Home Assistant service to control a specific device. "
-        "You MUST provide the exact entity_id from the device list in the system prompt. "
-        "Use this tool after identifying the correct device from the user's natural language request. "
-        "For example: if user says 'turn on the lamp', find the entity_id containing 'lamp' from the device list, "
-        "then call this tool with service='light.turn_on' and target_device='light.lamp_entity_id'."
-    )
-
-    parameters = vol.Schema(
-        {
-            vol.Required("service"): str,
-            vol.Required("target_device"): str,
-        }
-    )
+    description = _TOOL_DESCRIPTION
+
+    parameters = _PARAMS_SCHEMA
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the tool."""
@@ -71,16 +89,13 @@ class HassServiceTool(llm.Tool):
         self, hass: HomeAssistant, tool_input: llm.ToolInput, llm_context: llm.LLMContext
     ) -> dict:
         """Call the Home Assistant service."""
-        # EMERGENCY DEBUG: Print to ensure this is being called
-        print(f"\n{'='*80}")
-        print(f"TOOL CALLED: {tool_input.tool_args}")
-        print(f"{'='*80}\n")
-        
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("TOOL CALLED: %s", tool_input.tool_args)
+
         service = tool_input.tool_args.get("service")
         target_device = tool_input.tool_args.get("target_device")
 
-        # Use ERROR level to ensure it shows up
-        _LOGGER.error("🔧 TOOL CALL START: service=%s, device=%s", service, target_device)
+        _LOGGER.debug("🔧 TOOL CALL START: service=%s, device=%s", service, target_device)
 
         if not service or not target_device:
             error_msg = "Missing required parameters: service and target_device"
@@ -91,88 +106,43 @@ class HassServiceTool(llm.Tool):
             }
 
         # Validate service
-        try:
-            domain, service_name = service.split(".", 1)
-        except ValueError:
-            error_msg = f"Invalid service format: {service}. Expected 'domain.service'"
+        domain, service_name, error_msg = _validate_service(service)
+        if error_msg:
             _LOGGER.error("❌ Service call failed: %s", error_msg)
             return {
                 "result": "error",
                 "error": error_msg,
             }
 
-        # Check if domain is allowed
-        if domain not in SERVICE_TOOL_ALLOWED_DOMAINS:
-            error_msg = f"Service domain '{domain}' is not allowed"
-            _LOGGER.error("❌ Service call failed: %s", error_msg)
-            return {
-                "result": "error",
-                "error": error_msg,
-            }
-
-        # Check if service is allowed
-        if service not in SERVICE_TOOL_ALLOWED_SERVICES:
-            error_msg = f"Service '{service}' is not allowed"
-            _LOGGER.error("❌ Service call failed: %s", error_msg)
-            return {
-                "result": "error",
-                "error": error_msg,
-            }
+        # Build service data with any allowed additional arguments
+        tool_args = tool_input.tool_args
+        service_data = {
+            ATTR_ENTITY_ID: target_device,
+            **{key: tool_args[key] for key in ALLOWED_SERVICE_CALL_ARGUMENTS & tool_args.keys()},
+        }
 
-        # Build service data
-        service_data = {ATTR_ENTITY_ID: target_device}
+        _LOGGER.debug("📤 CALLING SERVICE: %s.%s with data: %s", domain, service_name, service_data)
 
-        # Add allowed additional arguments
-        for key, value in tool_input.tool_args.items():
-            if key in ALLOWED_SERVICE_CALL_ARGUMENTS:
-                service_data[key] = value
+        try:
+            # Use blocking=False so the tool never waits on the service to finish
+            await hass.services.async_call(
+                domain,
+                service_name,
+                service_data,
+                blocking=False,
+            )
 
-        _LOGGER.error("📤 CALLING SERVICE: %s.%s with data: %s", domain, service_name, service_data)
+            _LOGGER.debug("✅ Successfully called %s on %s", service, target_device)
 
-        try:
-            # Add timeout protection
-            async with asyncio.timeout(5.0):
-                _LOGGER.error("⏱️ Starting service call with 5s timeout...")
-                
-                # CRITICAL FIX: Use blocking=False to prevent hanging
-                await hass.services.async_call(
-                    domain,
-                    service_name,
-                    service_data,
-                    blocking=False,  # ✅ FIXED: Non-blocking to prevent infinite hang
-                )
-                
-                _LOGGER.error("⏱️ Service call returned (non-blocking)")
-            
-            success_msg = f"✅ Successfully called {service} on {target_device}"
-            _LOGGER.error(success_msg)
-            
-            print(f"\n{'='*80}")
-            print(f"TOOL SUCCESS: {success_msg}")
-            print(f"{'='*80}\n")
-            
             return {
                 "result": "success",
                 "service": service,
                 "target": target_device,
-                "message": success_msg,
-            }
-        except asyncio.TimeoutError:
-            error_msg = f"Timeout calling service {service} (took more than 5 seconds)"
-            _LOGGER.error("❌ %s", error_msg)
-            print(f"\n{'='*80}")
-            print(f"TOOL TIMEOUT: {error_msg}")
-            print(f"{'='*80}\n")
-            return {
-                "result": "error",
-                "error": error_msg,
+                "message": f"✅ Successfully called {service} on {target_device}",
             }
         except Exception as err:
             error_msg = f"Error calling service {service}: {err}"
             _LOGGER.error("❌ %s", error_msg, exc_info=True)
-            print(f"\n{'='*80}")
-            print(f"TOOL ERROR: {error_msg}")
-            print(f"{'='*80}\n")
             return {
                 "result": "error",
                 "error": error_msg,
@@ -187,42 +157,28 @@ class BedrockServicesAPI(llm.API):
         self.hass = hass
         self.id = id
         self.name = name
+        self._tools = (HassServiceTool(hass),)
 
     async def async_get_api_instance(
         self, llm_context: llm.LLMContext
     ) -> llm.APIInstance:
         """Get API instance."""
-        tools = [HassServiceTool(self.hass)]
-        
         return llm.APIInstance(
             api=self,
-            api_prompt=(
-                "You have access to the HassCallService tool to control Home Assistant devices. "
-                "CRITICAL: The device list in the system prompt contains all available devices with their entity_ids. "
-                "When the user asks to control a device, YOU MUST: "
-                "1. Search the device list for a matching entity based on the user's natural language (e.g., 'lamp', 'bedroom light') "
-                "2. Identify the correct entity_id from that list "
-                "3. Call HassCallService with the exact entity_id you found "
-                "NEVER ask the user for an entity_id - always find it yourself from the provided device list."
-            ),
+            api_prompt=_API_PROMPT,
             llm_context=llm_context,
-            tools=tools,
+            tools=self._tools,
         )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up AWS Bedrock Conversation from a config entry."""
-    # Use ERROR level to ensure visibility
-    _LOGGER.error("🚀 BEDROCK SETUP: Starting integration setup")
-    print("\n" + "="*80)
-    print("BEDROCK INTEGRATION SETUP STARTING")
-    print("="*80 + "\n")
-    
+    _LOGGER.debug("🚀 BEDROCK SETUP: Starting integration setup")
+
     # Register the LLM API if not already registered
-    existing_apis = [api.id for api in llm.async_get_apis(hass)]
-    if HOME_LLM_API_ID not in existing_apis:
+    if not any(api.id == HOME_LLM_API_ID for api in llm.async_get_apis(hass)):
         llm.async_register_api(hass, BedrockServicesAPI(hass, HOME_LLM_API_ID, "AWS Bedrock Services"))
-        _LOGGER.error("✅ BEDROCK SETUP: Registered Bedrock Services LLM API")
+        _LOGGER.debug("✅ BEDROCK SETUP: Registered Bedrock Services LLM API")
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = entry
@@ -235,12 +191,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
-    _LOGGER.error("✅ BEDROCK SETUP: Integration setup complete")
+    _LOGGER.debug("✅ BEDROCK SETUP: Integration setup complete")
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    _LOGGER.error("🔄 BEDROCK UNLOAD: Unloading integration")
+    _LOGGER.debug("🔄 BEDROCK UNLOAD: Unloading integration")
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
@@ -250,5 +206,5 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
-    _LOGGER.error("🔄 BEDROCK RELOAD: Reloading due to configuration change")
+    _LOGGER.debug("🔄 BEDROCK RELOAD: Reloading due to configuration change")
     await hass.config_entries.async_reload(entry.entry_id)
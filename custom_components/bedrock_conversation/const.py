@@ -61,7 +61,7 @@ DEFAULT_EXTRA_ATTRIBUTES: Final = [
 
 # Service tool configuration
 SERVICE_TOOL_NAME: Final = "HassCallService"
-SERVICE_TOOL_ALLOWED_DOMAINS: Final = [
+SERVICE_TOOL_ALLOWED_DOMAINS: Final = frozenset({
     "light",
     "switch",
     "fan",
@@ -77,8 +77,8 @@ SERVICE_TOOL_ALLOWED_DOMAINS: Final = [
     "input_select",
     "input_datetime",
     "timer",
-]
-SERVICE_TOOL_ALLOWED_SERVICES: Final = [
+})
+SERVICE_TOOL_ALLOWED_SERVICES: Final = frozenset({
     "light.turn_on",
     "light.turn_off",
     "light.toggle",
@@ -128,10 +128,11 @@ SERVICE_TOOL_ALLOWED_SERVICES: Final = [
     "timer.pause",
     "timer.cancel",
     "timer.finish",
-]
+})
 
-ALLOWED_SERVICE_CALL_ARGUMENTS: Final = [
+ALLOWED_SERVICE_CALL_ARGUMENTS: Final = frozenset({
     "brightness",
+    "brightness_pct",
     "rgb_color",
     "temperature",
     "humidity",
@@ -146,6 +147,7 @@ ALLOWED_SERVICE_CALL_ARGUMENTS: Final = [
     "target_temp_high",
     "target_temp_low",
     "position",
+    "tilt_position",
     "volume_level",
     "is_volume_muted",
     "media_content_id",
@@ -153,7 +155,7 @@ ALLOWED_SERVICE_CALL_ARGUMENTS: Final = [
     "value",
     "option",
     "datetime",
-]
+})
 
 AVAILABLE_MODELS: Final = [
     "us.anthropic.claude-sonnet-4-5-20250929-v1:0",
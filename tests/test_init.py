@@ -2,7 +2,7 @@
 import pytest
 from unittest.mock import MagicMock
 
-from custom_components.bedrock_conversation import HassServiceTool
+from custom_components.bedrock_conversation import HassServiceTool, _validate_service
 from custom_components.bedrock_conversation.const import (
     DOMAIN,
     SERVICE_TOOL_NAME,
@@ -29,3 +29,21 @@ def test_hass_service_tool_definition():
     assert tool.name == SERVICE_TOOL_NAME
     assert tool.description
     assert hasattr(tool, "parameters")
+
+
+def test_validate_service():
+    """Test service string validation."""
+    assert _validate_service("light.turn_on") == ("light", "turn_on", None)
+
+    domain, service_name, error = _validate_service("light")
+    assert error and "Invalid service format" in error
+
+    domain, service_name, error = _validate_service("light.")
+    assert error and "Invalid service format" in error
+
+    domain, service_name, error = _validate_service("homeassistant.restart")
+    assert domain == "homeassistant"
+    assert error == "Service domain 'homeassistant' is not allowed"
+
+    domain, service_name, error = _validate_service("light.flash")
+    assert error == "Service 'light.flash' is not allowed"